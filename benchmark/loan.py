@@ -0,0 +1,93 @@
+# Copyright 2021 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compare publishing a new message each time against Publisher.borrow().
+
+rclpy does not expose middleware loans, so borrow() hands out a pooled
+message and both paths still serialize.
+Only the cost of allocating the message differs, which matters for types
+with large fixed size arrays such as a custom message with
+``float64[1000000] data``.
+"""
+
+import argparse
+import time
+
+import reros
+from reros.message import import_type
+from reros.message import is_fixed_size
+
+from rosidl_parser.definition import Array
+from rosidl_parser.definition import BasicType
+
+
+def _largest_array_field(msg_type):
+    """Return the name and size of the largest fixed size array of basic values."""
+    best = None
+    for name, slot_type in zip(msg_type.get_fields_and_field_types(), msg_type.SLOT_TYPES):
+        if isinstance(slot_type, Array) and isinstance(slot_type.value_type, BasicType):
+            if best is None or slot_type.size > best[1]:
+                best = (name, slot_type.size)
+    return best
+
+
+def _time(label, count, func):
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    elapsed = time.perf_counter() - start
+    print('{:<32} {:8.3f} s {:10.1f} us/msg'.format(label, elapsed, elapsed / count * 1e6))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--type', required=True,
+        help='A fixed size message type with a large array, like pkg/msg/Name')
+    parser.add_argument('--count', type=int, default=1000)
+    args = parser.parse_args()
+
+    msg_type = import_type(args.type)
+    if not is_fixed_size(msg_type):
+        parser.error('{} is not a fixed size type'.format(args.type))
+    field = _largest_array_field(msg_type)
+    if field is None:
+        parser.error('{} has no fixed size array of basic values'.format(args.type))
+    field_name, size = field
+
+    # Fill the array the same way in both cases
+    values = list(getattr(msg_type(), field_name))
+    print('Publishing {} with {}[{}] filled'.format(args.type, field_name, size))
+    print('borrow() is a pooled fallback, not a middleware loan')
+
+    with reros.Context() as context:
+        node = reros.Node(context=context)
+        pub = reros.Publisher(msg_type, 'loan_benchmark', 10, node=node)
+
+        def copy():
+            msg = msg_type()
+            getattr(msg, field_name)[:] = values
+            pub.publish(msg)
+
+        def borrow():
+            with pub.borrow() as msg:
+                getattr(msg, field_name)[:] = values
+
+        _time('new message each publish', args.count, copy)
+        _time('borrow() pooled message', args.count, borrow)
+
+
+if __name__ == '__main__':
+    main()
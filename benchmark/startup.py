@@ -0,0 +1,57 @@
+# Copyright 2021 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure how long it takes to create publishers and subscribers for many topics."""
+
+import argparse
+import time
+
+import reros
+from reros.executor import Mediator
+
+from std_msgs.msg import String
+
+
+def _time(label, func):
+    start = time.perf_counter()
+    func()
+    print('{:<32} {:8.3f} s'.format(label, time.perf_counter() - start))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--topics', type=int, default=1000)
+    args = parser.parse_args()
+
+    with reros.Context() as context:
+        mediator = Mediator(context=context)
+
+        node = reros.Node(context=context)
+        topics = ['one_by_one_{}'.format(i) for i in range(args.topics)]
+        _time('Subscriber one by one', lambda: [
+            reros.Subscriber(String, t, 10, node=node, execution_mediator=mediator)
+            for t in topics])
+        _time('Publisher one by one', lambda: [
+            reros.Publisher(String, t, 10, node=node) for t in topics])
+
+        node = reros.Node(context=context)
+        topics = [(String, 'bulk_{}'.format(i)) for i in range(args.topics)]
+        _time('create_subscribers', lambda: reros.create_subscribers(
+            topics, 10, node=node, execution_mediator=mediator))
+        _time('create_publishers', lambda: reros.create_publishers(
+            topics, 10, node=node))
+
+
+if __name__ == '__main__':
+    main()
@@ -15,8 +15,15 @@
 from .context import Context
 from .context import DefaultContext
 
+from .graph import GraphCache
+
 from .node import Node
 from .node import DefaultNode
 
+from .publisher import create_publishers
 from .publisher import Publisher
+from .subscriber import create_subscribers
 from .subscriber import Subscriber
+
+from .selector import select
+from .selector import Selector
@@ -32,6 +32,17 @@ class Context(RclpyContext):
     ):
         super().__init__()
         super().init(args=args, domain_id=domain_id)
+        self.__graph_lock = Lock()
+        self.__graph = None
+
+    @property
+    def graph(self):
+        """Cache of the ROS graph as seen from this context, created on first use."""
+        with self.__graph_lock:
+            if self.__graph is None:
+                from .graph import GraphCache
+                self.__graph = GraphCache(self)
+            return self.__graph
 
     def __enter__(self):
         return self
@@ -47,5 +58,11 @@ class DefaultContext(Context):
     def __new__(cls, *args, **kwargs):
         with cls._lock:
             if cls._context is None or not cls._context.ok():
-                cls._context = object.__new__(DefaultContext, *args, **kwargs)
+                context = object.__new__(DefaultContext)
+                Context.__init__(context, *args, **kwargs)
+                cls._context = context
             return cls._context
+
+    def __init__(self, *args, **kwargs):
+        # The shared instance was initialized once in __new__
+        pass
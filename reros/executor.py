@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+from contextlib import contextmanager
 from threading import Lock
 from threading import Thread
 
@@ -48,7 +49,9 @@ class _MediatorHandle:
         self._has_untaken_data = True
 
         if self._ready_callback:
-            self._ready_callback()
+            # Work the entity wants done with its data, if any
+            return self._ready_callback()
+        return None
 
     def notify_took_data(self):
         """
@@ -87,6 +90,7 @@ class Mediator:
             executor = _ThreadPoolExecutor()
 
         self._context = context
+        self.__executor = executor
 
         # Use a dedidcated thread to notify ready entities
         self.__rcl_wait_thread = Thread(daemon=True, target=self.__rcl_wait)
@@ -101,6 +105,15 @@ class Mediator:
             self.__gc.pointer: (self.__gc, _MediatorHandle(None, None))
         }
         self.__timers = {}
+
+        # Guards the entity maps, which are filled from other threads while
+        # the wait thread reads them
+        self.__entities_lock = Lock()
+
+        # Registering entities only wakes the wait thread outside of batch()
+        self.__batch_lock = Lock()
+        self.__batch_depth = 0
+        self.__batch_pending = False
         # TODO Action clients?
         # TODO Action Servers?
 
@@ -117,11 +130,36 @@ class Mediator:
         handle = _MediatorHandle(self.__gc, ready_callback)
 
         if isinstance(entity, _rclpy.Subscription):
-            self.__subscribers[entity.pointer] = (entity, handle)
+            with self.__entities_lock:
+                self.__subscribers[entity.pointer] = (entity, handle)
 
+        with self.__batch_lock:
+            if self.__batch_depth:
+                self.__batch_pending = True
+                return handle
         self.__gc.trigger_guard_condition()
         return handle
 
+    @contextmanager
+    def batch(self):
+        """
+        Register many entities while waking the wait thread only once.
+
+        The wait set is rebuilt when the outermost batch exits.
+        """
+        with self.__batch_lock:
+            self.__batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self.__batch_lock:
+                self.__batch_depth -= 1
+                wake = self.__batch_depth == 0 and self.__batch_pending
+                if wake:
+                    self.__batch_pending = False
+            if wake:
+                self.__gc.trigger_guard_condition()
+
     def __notify_all_ready(self, ready_pointers, entity_map):
         for ptr in ready_pointers:
             # print(f'{ptr} is ready!')
@@ -134,38 +172,46 @@ class Mediator:
 
     def __resize_wait_set(self):
         # print('Resizing the wait set!')
+        # Snapshot the entities so registrations can't change them mid-build
+        with self.__entities_lock:
+            timers = list(self.__timers.values())
+            services = list(self.__services.values())
+            clients = list(self.__clients.values())
+            subscribers = list(self.__subscribers.values())
+            guard_conditions = list(self.__guard_conditions.values())
+
         # Resize the wait set
         self.__wait_set = _rclpy.WaitSet(
-            len(self.__subscribers),
-            len(self.__guard_conditions),
-            len(self.__timers),
-            len(self.__clients),
-            len(self.__services),
+            len(subscribers),
+            len(guard_conditions),
+            len(timers),
+            len(clients),
+            len(services),
             0,  # TODO events?
             self._context.handle)
 
         # Add entities to the wait set
-        for tmr, handle in self.__timers.values():
+        for tmr, handle in timers:
             if handle.has_untaken_data():
                 # print('has untaken data', tmr.pointer)
                 continue
             self.__wait_set.add_timer(tmr)
-        for srv, handle in self.__services.values():
+        for srv, handle in services:
             if handle.has_untaken_data():
                 # print('has untaken data', srv.pointer)
                 continue
             self.__wait_set.add_service(srv)
-        for cli, handle in self.__clients.values():
+        for cli, handle in clients:
             if handle.has_untaken_data():
                 # print('has untaken data', cli.pointer)
                 continue
             self.__wait_set.add_client(cli)
-        for sub, handle in self.__subscribers.values():
+        for sub, handle in subscribers:
             if handle.has_untaken_data():
                 # print('has untaken data', sub.pointer)
                 continue
             self.__wait_set.add_subscription(sub)
-        for gc, handle in self.__guard_conditions.values():
+        for gc, handle in guard_conditions:
             if handle.has_untaken_data():
                 # print('has untaken data', gc.pointer)
                 continue
@@ -245,6 +291,12 @@ class DefaultMediator(Mediator):
 
     def __new__(cls, *args, **kwargs):
         with cls._lock:
-            if cls._executor is None or not cls._executor.ok():
-                cls._executor = object.__new__(DefaultMediator, *args, **kwargs)
+            if cls._executor is None or not cls._executor._context.ok():
+                executor = object.__new__(DefaultMediator)
+                Mediator.__init__(executor, *args, **kwargs)
+                cls._executor = executor
             return cls._executor
+
+    def __init__(self, *args, **kwargs):
+        # The shared instance was initialized once in __new__
+        pass
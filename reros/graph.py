@@ -0,0 +1,148 @@
+# Copyright 2021 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from threading import Condition
+
+import time
+import uuid
+
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from .context import Context
+from .node import Node
+
+# Using non-public rclpy API that may break any time!
+from rclpy.impl.implementation_singleton import rclpy_implementation as _rclpy
+from rclpy.expand_topic_name import expand_topic_name
+from rclpy.topic_endpoint_info import TopicEndpointInfo
+
+
+# wait_for() checks its predicate on this backoff
+_MIN_RECHECK_PERIOD = 0.01
+_MAX_RECHECK_PERIOD = 0.5
+
+
+class GraphCache:
+    """
+    Answer questions about the ROS graph, reusing recent answers.
+
+    rclpy does not expose a notification when the graph changes, so results
+    are kept for at most ``max_age`` seconds.
+    Tools that query many times a second share one rmw query per interval,
+    and no result is more than ``max_age`` old.
+    :meth:`wait_for` polls with a bounded backoff.
+    """
+
+    def __init__(
+        self,
+        context: Context,
+        *,
+        max_age: float = 0.1,
+    ):
+        if max_age < 0:
+            raise ValueError('max_age must be greater than or equal to zero')
+
+        self.__context = context
+        self.__max_age = max_age
+        self.__cv = Condition()
+        self.__memo = {}
+        context.on_shutdown(self.__on_shutdown)
+
+        self.__node = Node('_reros_graph_' + uuid.uuid4().hex, context=context)
+
+    def __on_shutdown(self):
+        with self.__cv:
+            self.__cv.notify_all()
+
+    def __memoized(self, key, query: Callable):
+        now = time.monotonic()
+        with self.__cv:
+            cached = self.__memo.get(key)
+            if cached is not None and now - cached[0] <= self.__max_age:
+                return cached[1]
+
+        with self.__node.handle:
+            result = query(self.__node.handle)
+
+        with self.__cv:
+            self.__memo[key] = (now, result)
+        return result
+
+    def __expand(self, topic: str) -> str:
+        return expand_topic_name(topic, '_reros_graph', '/')
+
+    def topic_names_and_types(self) -> List[Tuple[str, List[str]]]:
+        return self.__memoized(
+            ('topics',),
+            lambda handle: _rclpy.rclpy_get_topic_names_and_types(handle, False))
+
+    def publishers_info(self, topic: str) -> List[TopicEndpointInfo]:
+        """Return the publishers on a topic and their QoS."""
+        topic = self.__expand(topic)
+        return self.__memoized(
+            ('publishers', topic),
+            lambda handle: [
+                TopicEndpointInfo(**info)
+                for info in _rclpy.rclpy_get_publishers_info_by_topic(handle, topic, False)])
+
+    def subscribers_info(self, topic: str) -> List[TopicEndpointInfo]:
+        """Return the subscribers on a topic and their QoS."""
+        topic = self.__expand(topic)
+        return self.__memoized(
+            ('subscribers', topic),
+            lambda handle: [
+                TopicEndpointInfo(**info)
+                for info in _rclpy.rclpy_get_subscriptions_info_by_topic(handle, topic, False)])
+
+    def count_publishers(self, topic: str) -> int:
+        return len(self.publishers_info(topic))
+
+    def count_subscribers(self, topic: str) -> int:
+        return len(self.subscribers_info(topic))
+
+    def wait_for(self, predicate: Callable[[], bool], timeout: Optional[float] = None) -> bool:
+        """
+        Wait until predicate returns True.
+
+        The predicate is polled, starting at 10 ms apart and backing off to
+        at most 0.5 s apart.
+
+        :return: True if the predicate was satisfied, or False on timeout or
+            when the context is shut down.
+        """
+        deadline = None
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+
+        period = _MIN_RECHECK_PERIOD
+        while self.__context.ok():
+            if predicate():
+                return True
+
+            wait_time = period
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait_time = min(wait_time, remaining)
+
+            with self.__cv:
+                # Shutdown wakes this early
+                if self.__context.ok():
+                    self.__cv.wait(wait_time)
+            period = min(period * 2, _MAX_RECHECK_PERIOD)
+        return False
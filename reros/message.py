@@ -0,0 +1,70 @@
+# Copyright 2021 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from functools import lru_cache
+import importlib
+
+from rosidl_parser.definition import AbstractNestedType
+from rosidl_parser.definition import Array
+from rosidl_parser.definition import BasicType
+from rosidl_parser.definition import NamespacedType
+
+
+def type_name(msg_type) -> str:
+    """
+    Return a name like 'std_msgs/msg/String' for a message class.
+
+    Messages generated for services and actions get names like
+    'example_interfaces/action/Fibonacci_FeedbackMessage'.
+    """
+    package, interface = msg_type.__module__.split('.')[:2]
+    return '{}/{}/{}'.format(package, interface, msg_type.__name__)
+
+
+def import_type(name: str):
+    """Import a message class from a name returned by type_name()."""
+    package, interface, class_name = name.split('/')
+    module = importlib.import_module('{}.{}'.format(package, interface))
+    try:
+        return getattr(module, class_name)
+    except AttributeError:
+        pass
+
+    # Messages generated for a service or action, like Fibonacci_Goal, are
+    # only in the private module of the service or action they belong to.
+    parent_name = class_name.split('_')[0]
+    parent = getattr(module, parent_name, None)
+    if parent is None:
+        raise ImportError('Cannot find {} in {}'.format(class_name, module.__name__))
+    return getattr(importlib.import_module(parent.__module__), class_name)
+
+
+def _is_fixed_size_slot(slot_type) -> bool:
+    if isinstance(slot_type, Array):
+        return _is_fixed_size_slot(slot_type.value_type)
+    if isinstance(slot_type, AbstractNestedType):
+        # Bounded and unbounded sequences
+        return False
+    if isinstance(slot_type, BasicType):
+        return True
+    if isinstance(slot_type, NamespacedType):
+        return is_fixed_size(import_type('/'.join(slot_type.namespaced_name())))
+    # Strings
+    return False
+
+
+@lru_cache(maxsize=None)
+def is_fixed_size(msg_type) -> bool:
+    """Return True if every message of this type serializes to the same size."""
+    return all(_is_fixed_size_slot(slot) for slot in msg_type.SLOT_TYPES)
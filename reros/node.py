@@ -38,7 +38,7 @@ class Node:
         # start_parameter_services: bool = True,
     ):
         if name is None:
-            name = 'reros_' + str(uuid.uuid4()).replace('-', '')
+            name = 'reros_' + uuid.uuid4().hex
         if context is None:
             context = DefaultContext()
 
@@ -57,6 +57,11 @@ class Node:
     def handle(self):
         return self.__node
 
+    @property
+    def graph(self):
+        """Cache of the ROS graph shared by all nodes in this node's context."""
+        return self._context.graph
+
 
 class DefaultNode(Node):
     _lock: Lock = Lock()
@@ -64,6 +69,13 @@ class DefaultNode(Node):
 
     def __new__(cls, *args, **kwargs):
         with cls._lock:
-            if cls._node is None or not cls._node.ok():
-                cls._node = object.__new__(DefaultNode, *args, **kwargs)
+            if cls._node is None or not cls._node._context.ok():
+                node = object.__new__(DefaultNode)
+                Node.__init__(node, *args, **kwargs)
+                cls._node = node
             return cls._node
+
+    def __init__(self, *args, **kwargs):
+        # The shared instance was initialized once in __new__, so entities
+        # created without a node share one rcl node
+        pass
@@ -12,10 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from contextlib import contextmanager
+from threading import Lock
+
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
 from typing import TypeVar, Union
 
+from .message import is_fixed_size
 from .node import DefaultNode
 from .node import Node
+from .qos import get_c_qos_profile
 
 # Using non-public rclpy API that may break any time!
 from rclpy.impl.implementation_singleton import rclpy_implementation as _rclpy
@@ -37,33 +47,48 @@ class Publisher:
         node: Node = None,
     ):
         check_is_valid_msg_type(msg_type)
-        self.__msg_type = msg_type
         if node is None:
             node = DefaultNode()
 
-        qos_profile = self._validate_qos_or_depth_parameter(qos_profile)
-
         with node.handle:
-            self.__publisher = _rclpy.Publisher(
-                node.handle, msg_type, topic, qos_profile.get_c_qos_profile())
-
-
-    # TODO(sloretz) this belongs elsewhere
-    def _validate_qos_or_depth_parameter(self, qos_or_depth) -> QoSProfile:
-        if isinstance(qos_or_depth, QoSProfile):
-            return qos_or_depth
-        elif isinstance(qos_or_depth, int):
-            if qos_or_depth < 0:
-                raise ValueError('history depth must be greater than or equal to zero')
-            return QoSProfile(depth=qos_or_depth)
-        else:
-            raise TypeError(
-                'Expected QoSProfile or int, but received {!r}'.format(type(qos_or_depth)))
+            self._init(msg_type, topic, get_c_qos_profile(qos_profile), node)
+
+    def _init(self, msg_type: MsgType, topic: str, c_qos_profile, node: Node):
+        """Finish constructing with a checked type and an entered node handle."""
+        self.__msg_type = msg_type
+        self.__node = node
+
+        # Messages handed out by borrow() that are free to be borrowed again
+        self.__loan_lock = Lock()
+        self.__loaned_messages = []
+
+        self.__publisher = _rclpy.Publisher(
+            node.handle, msg_type, topic, c_qos_profile)
 
     @property
     def handle(self):
         return self.__publisher
 
+    @property
+    def topic_name(self) -> str:
+        with self.handle:
+            return self.__publisher.get_topic_name()
+
+    def wait_for_subscribers(self, count: int = 1, *, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until at least count subscribers are matched with this publisher.
+
+        Only subscribers the middleware matched count, so ones with another
+        message type or incompatible QoS are not included.
+
+        :return: True if they were matched, or False on timeout or shutdown.
+        """
+        def matched():
+            with self.handle:
+                return self.__publisher.get_subscription_count() >= count
+
+        return self.__node.graph.wait_for(matched, timeout)
+
     def publish(self, msg: Union[MsgType, bytes]):
         with self.handle:
             if isinstance(msg, self.__msg_type):
@@ -72,3 +97,65 @@ class Publisher:
                 self.__publisher.publish_raw(msg)
             else:
                 raise TypeError('Expected {}, got {}'.format(self.__msg_type, type(msg)))
+
+    @contextmanager
+    def borrow(self) -> Iterator[MsgType]:
+        """
+        Borrow a message to fill in, and publish it when the block exits.
+
+        .. code-block:: python
+
+            with pub.borrow() as msg:
+                msg.data[:] = values
+
+        rclpy does not expose rmw loaned messages, so the message comes from a
+        pool owned by this publisher instead.
+        Reusing it avoids allocating large fixed size arrays for every
+        message, but like a middleware loan it may still hold the contents of
+        a previously published message.
+        The message must not be used after the block exits.
+        Nothing is published if the block raises.
+        """
+        if not is_fixed_size(self.__msg_type):
+            raise TypeError('Only messages with a fixed size can be borrowed,'
+                            ' but {} is not'.format(self.__msg_type))
+
+        with self.__loan_lock:
+            if self.__loaned_messages:
+                msg = self.__loaned_messages.pop()
+            else:
+                msg = self.__msg_type()
+        try:
+            yield msg
+            self.publish(msg)
+        finally:
+            with self.__loan_lock:
+                self.__loaned_messages.append(msg)
+
+
+def create_publishers(
+    msg_types_and_topics: Iterable[Tuple[MsgType, str]],
+    qos_profile: Union[QoSProfile, int],
+    *,
+    node: Node = None,
+) -> List[Publisher]:
+    """
+    Create many publishers on one node.
+
+    The node handle is entered once, QoS is resolved once, and each message
+    type is checked once.
+    """
+    msg_types_and_topics = list(msg_types_and_topics)
+    for msg_type in {msg_type for msg_type, _ in msg_types_and_topics}:
+        check_is_valid_msg_type(msg_type)
+    if node is None:
+        node = DefaultNode()
+    c_qos_profile = get_c_qos_profile(qos_profile)
+
+    publishers = []
+    with node.handle:
+        for msg_type, topic in msg_types_and_topics:
+            pub = Publisher.__new__(Publisher)
+            pub._init(msg_type, topic, c_qos_profile, node)
+            publishers.append(pub)
+    return publishers
@@ -0,0 +1,75 @@
+# Copyright 2021 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from threading import Lock
+from typing import Dict
+from typing import Hashable
+from typing import Tuple
+from typing import Union
+
+from rclpy.qos import QoSProfile
+
+
+_lock: Lock = Lock()
+_depth_profiles: Dict[int, QoSProfile] = {}
+_c_profiles: Dict[Tuple[Hashable, ...], object] = {}
+
+
+def validate_qos_or_depth_parameter(qos_or_depth: Union[QoSProfile, int]) -> QoSProfile:
+    """
+    Return a QoSProfile given either a profile or a history depth.
+
+    Profiles made from a depth are shared, so they must not be modified.
+    """
+    if isinstance(qos_or_depth, QoSProfile):
+        return qos_or_depth
+    elif isinstance(qos_or_depth, int):
+        if qos_or_depth < 0:
+            raise ValueError('history depth must be greater than or equal to zero')
+        with _lock:
+            profile = _depth_profiles.get(qos_or_depth)
+            if profile is None:
+                profile = QoSProfile(depth=qos_or_depth)
+                _depth_profiles[qos_or_depth] = profile
+            return profile
+    else:
+        raise TypeError(
+            'Expected QoSProfile or int, but received {!r}'.format(type(qos_or_depth)))
+
+
+def _profile_key(qos_profile: QoSProfile) -> Tuple[Hashable, ...]:
+    # QoSProfile is mutable and unhashable, so key on the values it has now
+    return (
+        qos_profile.history,
+        qos_profile.depth,
+        qos_profile.reliability,
+        qos_profile.durability,
+        qos_profile.lifespan.nanoseconds,
+        qos_profile.deadline.nanoseconds,
+        qos_profile.liveliness,
+        qos_profile.liveliness_lease_duration.nanoseconds,
+        qos_profile.avoid_ros_namespace_conventions,
+    )
+
+
+def get_c_qos_profile(qos_or_depth: Union[QoSProfile, int]):
+    """Return the rmw QoS profile to give to rclpy, reusing ones already made."""
+    qos_profile = validate_qos_or_depth_parameter(qos_or_depth)
+    key = _profile_key(qos_profile)
+    with _lock:
+        c_profile = _c_profiles.get(key)
+        if c_profile is None:
+            c_profile = qos_profile.get_c_qos_profile()
+            _c_profiles[key] = c_profile
+        return c_profile
@@ -0,0 +1,490 @@
+# Copyright 2021 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Record serialized messages to a file and replay them.
+
+Messages are never deserialized; the recorder takes them raw from each
+:class:`Subscriber` and the replayer hands the bytes to
+:meth:`Publisher.publish`.
+
+File layout, all integers little endian::
+
+    header:  b'REROSREC' u32 version u16 topic_count
+             topic_count * (u16 topic_id u16 len name u16 len type)
+    chunks:  b'CHNK' u32 record_count i64 start_ns i64 end_ns u64 payload_len
+             payload = record_count * (u16 topic_id i64 recv_ns u32 len data)
+    index:   b'INDX' u32 chunk_count
+             chunk_count * (u64 offset i64 start_ns i64 end_ns u32 record_count)
+    footer:  u64 index_offset b'REROSEND'
+
+Records in a chunk are sorted by receive time.
+The index and footer are written when the recorder is closed.
+If they are missing the replayer rebuilds the index by scanning chunks.
+"""
+
+from bisect import bisect_left
+import heapq
+import mmap
+from queue import SimpleQueue
+import struct
+from threading import Thread
+
+import time
+
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+from typing import Union
+
+from .message import import_type
+from .message import type_name
+from .node import DefaultNode
+from .node import Node
+from .publisher import Publisher
+from .subscriber import Subscriber
+
+from rclpy.qos import QoSProfile
+
+
+MsgType = TypeVar('MsgType')
+
+_MAGIC = b'REROSREC'
+_END_MAGIC = b'REROSEND'
+_VERSION = 1
+
+_FILE_HEADER = struct.Struct('<8sIH')
+_TOPIC_HEADER = struct.Struct('<HH')
+_STR_LEN = struct.Struct('<H')
+_CHUNK_HEADER = struct.Struct('<4sIqqQ')
+_RECORD_HEADER = struct.Struct('<HqI')
+_INDEX_HEADER = struct.Struct('<4sI')
+_INDEX_ENTRY = struct.Struct('<QqqI')
+_FOOTER = struct.Struct('<Q8s')
+
+
+class ChunkInfo(NamedTuple):
+    offset: int
+    start_ns: int
+    end_ns: int
+    record_count: int
+
+
+class RecordedMessage(NamedTuple):
+    topic: str
+    received_ns: int
+    data: bytes
+
+
+class RecordWriter:
+    """
+    Write serialized messages into chunks of a recording file.
+
+    Records in each chunk are sorted by receive time when the chunk is
+    written, so a chunk is in receive order even if records were appended
+    out of order.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        topics: Iterable[Tuple[str, str]],
+        *,
+        chunk_size: int = 1024 * 1024,
+        buffer_size: int = 1024 * 1024,
+    ):
+        """
+        :param topics: (topic name, message type name) pairs; a topic's
+            position in this sequence is the topic_id given to append().
+        """
+        if chunk_size <= 0:
+            raise ValueError('chunk_size must be greater than zero')
+
+        topics = list(topics)
+        if len(topics) > 0xffff:
+            raise ValueError('Cannot record more than 65535 topics in one file')
+
+        self.__chunk_size = chunk_size
+        self.__chunk: List[Tuple[int, int, bytes]] = []
+        self.__chunk_bytes = 0
+        self.__index: List[ChunkInfo] = []
+
+        self.__file = open(path, 'wb', buffering=buffer_size)
+        self.__write_header(topics)
+
+    def __write_header(self, topics):
+        self.__file.write(_FILE_HEADER.pack(_MAGIC, _VERSION, len(topics)))
+        for topic_id, (topic, msg_type_name) in enumerate(topics):
+            name = topic.encode()
+            msg_type_name = msg_type_name.encode()
+            self.__file.write(_TOPIC_HEADER.pack(topic_id, len(name)))
+            self.__file.write(name)
+            self.__file.write(_STR_LEN.pack(len(msg_type_name)))
+            self.__file.write(msg_type_name)
+
+    def append(self, topic_id: int, received_ns: int, data: bytes):
+        self.__chunk.append((received_ns, topic_id, data))
+        self.__chunk_bytes += _RECORD_HEADER.size + len(data)
+        if self.__chunk_bytes >= self.__chunk_size:
+            self.flush_chunk()
+
+    def flush_chunk(self):
+        """Write the records appended so far as one chunk."""
+        if not self.__chunk:
+            return
+        # Stable sort keeps arrival order for records with equal timestamps
+        self.__chunk.sort(key=lambda record: record[0])
+        start_ns = self.__chunk[0][0]
+        end_ns = self.__chunk[-1][0]
+
+        offset = self.__file.tell()
+        self.__file.write(_CHUNK_HEADER.pack(
+            b'CHNK', len(self.__chunk), start_ns, end_ns, self.__chunk_bytes))
+        for received_ns, topic_id, data in self.__chunk:
+            self.__file.write(_RECORD_HEADER.pack(topic_id, received_ns, len(data)))
+            self.__file.write(data)
+        self.__index.append(ChunkInfo(offset, start_ns, end_ns, len(self.__chunk)))
+
+        self.__chunk = []
+        self.__chunk_bytes = 0
+
+    def close(self):
+        """Write the last chunk, the index, and the footer."""
+        if self.__file.closed:
+            return
+        try:
+            self.flush_chunk()
+            index_offset = self.__file.tell()
+            self.__file.write(_INDEX_HEADER.pack(b'INDX', len(self.__index)))
+            for entry in self.__index:
+                self.__file.write(_INDEX_ENTRY.pack(*entry))
+            self.__file.write(_FOOTER.pack(index_offset, _END_MAGIC))
+        finally:
+            self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, t, v, tb):
+        self.close()
+
+
+class Recorder:
+    """
+    Record serialized messages from many topics into one file.
+
+    Messages are taken raw on a single background thread and written into
+    chunks through a buffered file, so recording never deserializes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        topics: Iterable[Tuple[MsgType, str]],
+        qos_profile: Union[QoSProfile, int] = 10,
+        *,
+        node: Node = None,
+        execution_mediator = None,
+        chunk_size: int = 1024 * 1024,
+        buffer_size: int = 1024 * 1024,
+    ):
+        if node is None:
+            node = DefaultNode()
+
+        topics = list(topics)
+        self.__writer = RecordWriter(
+            path, [(topic, type_name(msg_type)) for msg_type, topic in topics],
+            chunk_size=chunk_size, buffer_size=buffer_size)
+
+        # Subscribers with data ready are handed to the writer thread
+        self.__ready = SimpleQueue()
+        self.__closed = False
+        self.__error: Optional[BaseException] = None
+
+        self.__subscribers = {}
+        for topic_id, (msg_type, topic) in enumerate(topics):
+            sub = Subscriber(
+                msg_type, topic, qos_profile,
+                node=node, execution_mediator=execution_mediator)
+            self.__subscribers[sub] = topic_id
+
+        self.__writer_thread = Thread(daemon=True, target=self.__write_loop)
+        self.__writer_thread.start()
+
+        for sub in self.__subscribers:
+            sub._add_ready_listener(self.__ready.put)
+
+    def __write_loop(self):
+        try:
+            while True:
+                sub = self.__ready.get()
+                if sub is None:
+                    break
+                topic_id = self.__subscribers[sub]
+
+                # Drain everything the subscriber has so far
+                while True:
+                    msg_info = sub.take_with_info(raw=True)
+                    if msg_info is None:
+                        break
+                    data, info = msg_info
+                    received_ns = info.get('received_timestamp') or time.time_ns()
+                    self.__writer.append(topic_id, received_ns, data)
+        except BaseException as e:
+            # Reported by close()
+            self.__error = e
+        finally:
+            try:
+                self.__writer.close()
+            except BaseException as e:
+                if self.__error is None:
+                    self.__error = e
+
+    def close(self):
+        """
+        Stop recording and finish writing the file.
+
+        Errors from the writer thread are raised here.
+        The subscriptions stay registered with the node and mediator, because
+        neither can remove entities yet; the recorder only stops taking from
+        them.
+        """
+        if self.__closed:
+            return
+        self.__closed = True
+        for sub in self.__subscribers:
+            sub._remove_ready_listener(self.__ready.put)
+        self.__ready.put(None)
+        self.__writer_thread.join()
+        if self.__error is not None:
+            raise self.__error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, t, v, tb):
+        self.close()
+
+
+class Replayer:
+    """
+    Replay a file written by :class:`Recorder`.
+
+    The file is memory mapped, and messages are published without being
+    deserialized.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        node: Node = None,
+    ):
+        self.__node = node
+        self.__publishers: Dict[str, Publisher] = {}
+
+        with open(path, 'rb') as f:
+            self.__map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.__topics: Dict[int, Tuple[str, str]] = {}
+        chunks_offset = self.__read_header()
+        self.__index = self.__read_index()
+        if self.__index is None:
+            self.__index = self.__scan_chunks(chunks_offset)
+
+        # Chunks may overlap in time slightly, so seek on the latest end time so far
+        self.__seek_keys = []
+        latest = None
+        for chunk in self.__index:
+            if latest is None or chunk.end_ns > latest:
+                latest = chunk.end_ns
+            self.__seek_keys.append(latest)
+
+        # Earliest start time of each chunk and every chunk after it
+        self.__earliest_starts = [0] * len(self.__index)
+        earliest = None
+        for i in reversed(range(len(self.__index))):
+            start = self.__index[i].start_ns
+            if earliest is None or start < earliest:
+                earliest = start
+            self.__earliest_starts[i] = earliest
+
+    def __read_header(self) -> int:
+        magic, version, topic_count = _FILE_HEADER.unpack_from(self.__map, 0)
+        if magic != _MAGIC:
+            raise ValueError('Not a reros recording')
+        if version != _VERSION:
+            raise ValueError('Unsupported recording version {}'.format(version))
+
+        offset = _FILE_HEADER.size
+        for _ in range(topic_count):
+            topic_id, name_len = _TOPIC_HEADER.unpack_from(self.__map, offset)
+            offset += _TOPIC_HEADER.size
+            name = self.__map[offset:offset + name_len].decode()
+            offset += name_len
+            type_len, = _STR_LEN.unpack_from(self.__map, offset)
+            offset += _STR_LEN.size
+            msg_type_name = self.__map[offset:offset + type_len].decode()
+            offset += type_len
+            self.__topics[topic_id] = (name, msg_type_name)
+        return offset
+
+    def __read_index(self) -> Optional[List[ChunkInfo]]:
+        size = len(self.__map)
+        if size < _FOOTER.size:
+            return None
+        index_offset, end_magic = _FOOTER.unpack_from(self.__map, size - _FOOTER.size)
+        if end_magic != _END_MAGIC:
+            return None
+
+        tag, chunk_count = _INDEX_HEADER.unpack_from(self.__map, index_offset)
+        if tag != b'INDX':
+            return None
+        offset = index_offset + _INDEX_HEADER.size
+        index = []
+        for _ in range(chunk_count):
+            index.append(ChunkInfo(*_INDEX_ENTRY.unpack_from(self.__map, offset)))
+            offset += _INDEX_ENTRY.size
+        return index
+
+    def __scan_chunks(self, offset: int) -> List[ChunkInfo]:
+        """Rebuild the index of a recording that was not closed cleanly."""
+        index = []
+        size = len(self.__map)
+        while offset + _CHUNK_HEADER.size <= size:
+            tag, count, start, end, length = _CHUNK_HEADER.unpack_from(self.__map, offset)
+            if tag != b'CHNK' or offset + _CHUNK_HEADER.size + length > size:
+                break
+            index.append(ChunkInfo(offset, start, end, count))
+            offset += _CHUNK_HEADER.size + length
+        return index
+
+    @property
+    def topics(self) -> Dict[str, str]:
+        """Map of recorded topic names to message type names."""
+        return dict(self.__topics.values())
+
+    @property
+    def start_ns(self) -> Optional[int]:
+        if not self.__index:
+            return None
+        return min(chunk.start_ns for chunk in self.__index)
+
+    @property
+    def end_ns(self) -> Optional[int]:
+        if not self.__seek_keys:
+            return None
+        return self.__seek_keys[-1]
+
+    def __chunk_messages(
+        self, chunk: ChunkInfo, start_ns: Optional[int]
+    ) -> Iterator[RecordedMessage]:
+        offset = chunk.offset + _CHUNK_HEADER.size
+        for _ in range(chunk.record_count):
+            topic_id, received_ns, length = _RECORD_HEADER.unpack_from(self.__map, offset)
+            offset += _RECORD_HEADER.size
+            if start_ns is None or received_ns >= start_ns:
+                yield RecordedMessage(
+                    self.__topics[topic_id][0], received_ns,
+                    self.__map[offset:offset + length])
+            offset += length
+
+    def messages(self, start_ns: Optional[int] = None) -> Iterator[RecordedMessage]:
+        """
+        Iterate over recorded messages in the order they were received.
+
+        :param start_ns: skip messages received before this time.
+        """
+        first_chunk = 0
+        if start_ns is not None:
+            first_chunk = bisect_left(self.__seek_keys, start_ns)
+
+        # Each chunk is sorted, but neighboring chunks may overlap in time.
+        # Only chunks that may hold a message earlier than the next one to
+        # yield are opened, so the merge stays local.
+        chunks = self.__index[first_chunk:]
+        earliest_start = self.__earliest_starts[first_chunk:]
+        pending = []
+        next_chunk = 0
+
+        def push_next(i, messages):
+            msg = next(messages, None)
+            if msg is not None:
+                heapq.heappush(pending, (msg.received_ns, i, msg, messages))
+
+        while True:
+            while next_chunk < len(chunks) and (
+                    not pending or earliest_start[next_chunk] <= pending[0][0]):
+                push_next(next_chunk, self.__chunk_messages(chunks[next_chunk], start_ns))
+                next_chunk += 1
+            if not pending:
+                return
+            _, i, msg, messages = heapq.heappop(pending)
+            yield msg
+            push_next(i, messages)
+
+    def __publisher(self, topic: str, qos_profile) -> Publisher:
+        pub = self.__publishers.get(topic)
+        if pub is None:
+            topic_types = self.topics
+            if self.__node is None:
+                self.__node = DefaultNode()
+            pub = Publisher(
+                import_type(topic_types[topic]), topic, qos_profile, node=self.__node)
+            self.__publishers[topic] = pub
+        return pub
+
+    def play(
+        self,
+        *,
+        rate: Optional[float] = 1.0,
+        start_ns: Optional[int] = None,
+        qos_profile: Union[QoSProfile, int] = 10,
+    ):
+        """
+        Publish the recorded messages.
+
+        :param rate: playback speed relative to the recording, or None to
+            publish as fast as possible.
+        :param start_ns: skip messages received before this time.
+        """
+        if rate is not None and rate <= 0:
+            raise ValueError('rate must be greater than zero')
+
+        first_ns = None
+        wall_start = None
+        for msg in self.messages(start_ns):
+            pub = self.__publisher(msg.topic, qos_profile)
+            if rate is not None:
+                if first_ns is None:
+                    first_ns = msg.received_ns
+                    wall_start = time.monotonic()
+                delay = wall_start + (msg.received_ns - first_ns) / rate / 1e9 - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            pub.publish(msg.data)
+
+    def close(self):
+        self.__map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, t, v, tb):
+        self.close()
@@ -0,0 +1,213 @@
+# Copyright 2021 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from collections import deque
+from threading import Condition
+
+import time
+
+from typing import Any
+from typing import Optional
+from typing import Tuple
+
+from .subscriber import Subscriber
+
+
+class Selector:
+    """
+    Wait on several subscribers at once and yield their messages.
+
+    Each item is a ``(subscriber, msg)`` tuple.
+    Messages are yielded in readiness order: subscribers are served one
+    message at a time in the order they reported data, and a subscriber with
+    more data goes to the back of the line, so a busy topic can't starve the
+    others.
+    This is not strictly the order messages were received across topics.
+    Iteration stops when no message arrives within ``timeout`` seconds, and
+    the selector closes itself when it stops.
+    Use it as a context manager to close it when leaving a loop early.
+    The selector can be iterated synchronously or with ``async for``.
+    """
+
+    def __init__(self, *subscribers: Subscriber, timeout: Optional[float] = None):
+        if not subscribers:
+            raise ValueError('Expected at least one subscriber to select on')
+        if timeout is not None and timeout < 0:
+            raise ValueError('timeout must be greater than or equal to zero')
+
+        self.__subscribers = subscribers
+        self.__timeout = timeout
+
+        # Subscribers with data ready, in the order they became ready
+        self.__ready = deque()
+        self.__ready_set = set()
+        self.__cv = Condition()
+
+        # asyncio futures of coroutines waiting in __anext__
+        self.__async_waiters = []
+
+        self.__closed = False
+        for sub in self.__subscribers:
+            sub._add_ready_listener(self.__notify_ready)
+
+    def __notify_ready(self, subscriber: Subscriber):
+        """Called from the mediator's wait thread when a subscriber has data."""
+        with self.__cv:
+            if subscriber not in self.__ready_set:
+                self.__ready_set.add(subscriber)
+                self.__ready.append(subscriber)
+            self.__cv.notify()
+            waiters = self.__async_waiters
+            self.__async_waiters = []
+
+        _wake_async_waiters(waiters)
+
+    def __try_take(self) -> Optional[Tuple[Subscriber, Any]]:
+        """Take from the next ready subscriber, or return None if none have data."""
+        while True:
+            with self.__cv:
+                if not self.__ready:
+                    return None
+                subscriber = self.__ready.popleft()
+                self.__ready_set.discard(subscriber)
+
+            msg = subscriber.take()
+            if msg is not None:
+                # It may have more data; requeue it now instead of waiting for
+                # the mediator to notice. The next take drops it if it is empty.
+                with self.__cv:
+                    if not self.__closed and subscriber not in self.__ready_set:
+                        self.__ready_set.add(subscriber)
+                        self.__ready.append(subscriber)
+                return subscriber, msg
+
+    def close(self):
+        """Stop selecting on the subscribers."""
+        if self.__closed:
+            return
+        self.__closed = True
+        for sub in self.__subscribers:
+            sub._remove_ready_listener(self.__notify_ready)
+
+        with self.__cv:
+            self.__cv.notify_all()
+            waiters = self.__async_waiters
+            self.__async_waiters = []
+
+        _wake_async_waiters(waiters)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, t, v, tb):
+        self.close()
+
+    def __iter__(self):
+        """Synchronous message iterator."""
+        return self
+
+    def __next__(self) -> Tuple[Subscriber, Any]:
+        deadline = None
+        if self.__timeout is not None:
+            deadline = time.monotonic() + self.__timeout
+
+        while not self.__closed:
+            item = self.__try_take()
+            if item is not None:
+                return item
+
+            with self.__cv:
+                if self.__ready or self.__closed:
+                    continue
+                if deadline is None:
+                    self.__cv.wait()
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self.__cv.wait(remaining):
+                        break
+        self.close()
+        raise StopIteration
+
+    def __aiter__(self):
+        """Asynchronous message iterator."""
+        return self
+
+    async def __anext__(self) -> Tuple[Subscriber, Any]:
+        loop = asyncio.get_running_loop()
+        deadline = None
+        if self.__timeout is not None:
+            deadline = loop.time() + self.__timeout
+
+        while not self.__closed:
+            item = self.__try_take()
+            if item is not None:
+                return item
+
+            future = loop.create_future()
+            with self.__cv:
+                if self.__ready or self.__closed:
+                    continue
+                self.__async_waiters.append((loop, future))
+
+            try:
+                if deadline is None:
+                    await future
+                else:
+                    remaining = deadline - loop.time()
+                    await asyncio.wait_for(future, max(remaining, 0))
+            except asyncio.TimeoutError:
+                break
+            finally:
+                # Don't leave a waiter behind if this task timed out or was cancelled
+                with self.__cv:
+                    if (loop, future) in self.__async_waiters:
+                        self.__async_waiters.remove((loop, future))
+        self.close()
+        raise StopAsyncIteration
+
+
+def _set_future_done(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+def _wake_async_waiters(waiters):
+    for loop, future in waiters:
+        try:
+            loop.call_soon_threadsafe(_set_future_done, future)
+        except RuntimeError:
+            # The loop was closed; this must not kill the mediator's wait thread
+            pass
+
+
+def select(*subscribers: Subscriber, timeout: Optional[float] = None) -> Selector:
+    """
+    Iterate over messages from any of the given subscribers.
+
+    .. code-block:: python
+
+        for sub, msg in reros.select(chatter_sub, status_sub, timeout=5.0):
+            ...
+
+        # Leaving the loop early needs the context manager to close it
+        with reros.select(chatter_sub, status_sub) as selector:
+            for sub, msg in selector:
+                if done(msg):
+                    break
+
+    :param timeout: seconds to wait for the next message before stopping,
+        or None to wait forever.
+    """
+    return Selector(*subscribers, timeout=timeout)
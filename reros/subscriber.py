@@ -12,20 +12,31 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from contextlib import contextmanager
 from threading import Event
 
 from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Tuple
 from typing import TypeVar
 from typing import Union
 from typing import Optional
 
 from .executor import DefaultMediator
 
+from .message import is_fixed_size
+from .message import type_name
 from .node import DefaultNode
 from .node import Node
+from .qos import get_c_qos_profile
+from .qos import validate_qos_or_depth_parameter
 
 # Using non-public rclpy API that may break any time!
 from rclpy.impl.implementation_singleton import rclpy_implementation as _rclpy
+from rclpy.qos import qos_check_compatible
+from rclpy.qos import QoSCompatibility
 from rclpy.qos import QoSProfile
 from rclpy.type_support import check_is_valid_msg_type
 
@@ -33,6 +44,19 @@ from rclpy.type_support import check_is_valid_msg_type
 MsgType = TypeVar('MsgType')
 
 
+def _node_and_mediator(node: Optional[Node], execution_mediator):
+    if node is None:
+        node = DefaultNode()
+
+    if execution_mediator is None:
+        execution_mediator = DefaultMediator()
+
+    if execution_mediator._context != node._context:
+        raise RuntimeError('execution_mediator and node must belong'
+                           ' to the same context')
+    return node, execution_mediator
+
+
 class Subscriber:
 
     def __init__(
@@ -46,25 +70,36 @@ class Subscriber:
         execution_mediator = None
     ):
         check_is_valid_msg_type(msg_type)
-        self.__msg_type = msg_type
-        if node is None:
-            node = DefaultNode()
+        node, execution_mediator = _node_and_mediator(node, execution_mediator)
 
-        if execution_mediator is None:
-            execution_mediator = DefaultMediator()
+        qos_profile = validate_qos_or_depth_parameter(qos_profile)
 
-        if execution_mediator._context != node._context:
-            raise RuntimeError('execution_mediator and node must belong'
-                               ' to the same context')
+        with node.handle:
+            self._init(
+                msg_type, topic, qos_profile, get_c_qos_profile(qos_profile), node,
+                callback, execution_mediator)
+
+    def _init(
+        self,
+        msg_type: MsgType,
+        topic: str,
+        qos_profile: QoSProfile,
+        c_qos_profile,
+        node: Node,
+        callback: Optional[Callable],
+        execution_mediator,
+    ):
+        """Finish constructing with a checked type and an entered node handle."""
+        self.__msg_type = msg_type
+        self.__qos_profile = qos_profile
+        self.__node = node
 
         self.__callback = callback
         self.__data_ready = Event()
+        self.__ready_listeners = []
 
-        qos_profile = self._validate_qos_or_depth_parameter(qos_profile)
-
-        with node.handle:
-            self.__subscriber = _rclpy.Subscription(
-                node.handle, msg_type, topic, qos_profile.get_c_qos_profile())
+        self.__subscriber = _rclpy.Subscription(
+            node.handle, msg_type, topic, c_qos_profile)
 
         self.__execution_handle = execution_mediator.register_entity(
             self.__subscriber,
@@ -82,29 +117,84 @@ class Subscriber:
         # Notify the synchronous iterator that data is ready
         self.__data_ready.set()
 
+        # Notify anything selecting on this subscriber that data is ready
+        for listener in tuple(self.__ready_listeners):
+            listener(self)
+
         # TODO Notify an asynchronous iterator that data is ready
 
-    def __take_data(self):
-        """Take data from the subscription and return the message."""
+    def _add_ready_listener(self, listener: Callable):
+        """
+        Call listener with this subscriber whenever it has data ready.
+
+        The listener is called from the mediator's wait thread, so it must
+        be quick and must not block.
+        """
+        if self.__callback is not None:
+            raise RuntimeError('Cannot listen for data because this'
+                               ' subscription is using the callback interface.')
+        self.__ready_listeners.append(listener)
+
+        # Data may have arrived before the listener was added
+        if self.__data_ready.is_set():
+            listener(self)
+
+    def _remove_ready_listener(self, listener: Callable):
+        self.__ready_listeners.remove(listener)
+
+    def __take_data(self, raw: bool = False):
+        """Take data from the subscription and return the message and its metadata."""
         # Get data from the lower level
-        raw = False
         msg_metadata = self.__subscriber.take_message(self.__msg_type, raw)
 
         if msg_metadata is None:
             return None
 
-        # TODO what to do with metadata?
-
         # Tell synchronous iterator data is no longer ready
         self.__data_ready.clear()
 
         # Tell the executor we got the data (last to avoid race with __data_ready being set)
         self.__execution_handle.notify_took_data()
         
+        return msg_metadata
+
+    def take(self, *, raw: bool = False) -> Optional[Union[MsgType, bytes]]:
+        """
+        Take a message if one is available, or return None without blocking.
+
+        :param raw: if True return the serialized message as bytes.
+        """
+        msg_metadata = self.__take_data(raw)
+        if msg_metadata is None:
+            return None
         return msg_metadata[0]
 
+    def take_with_info(self, *, raw: bool = False) -> Optional[Tuple[Union[MsgType, bytes], dict]]:
+        """
+        Take a message and its metadata, or return None without blocking.
+
+        The metadata is a dict with keys like ``source_timestamp`` and
+        ``received_timestamp`` as given by the middleware.
+        """
+        return self.__take_data(raw)
+
+    @contextmanager
+    def take_loaned(self) -> Iterator[Optional[MsgType]]:
+        """
+        Take a message for use only inside the block, or None if none is available.
+
+        This mirrors :meth:`Publisher.borrow` so code can be written against
+        middleware loans.
+        rclpy does not expose rmw loaned messages, so the message is taken
+        with the standard copy, and must not be used after the block exits.
+        """
+        if not is_fixed_size(self.__msg_type):
+            raise TypeError('Only messages with a fixed size can be loaned,'
+                            ' but {} is not'.format(self.__msg_type))
+        yield self.take()
+
     def __call_callback(self):
-        self.__call_callback(self.__take_data())
+        self.__callback(self.take())
 
     def __iter__(self):
         """Synchronous message iterator."""
@@ -118,22 +208,72 @@ class Subscriber:
         # TODO raise StopIteration if the context is shutdown
         msg = None
         while None == msg:
-            msg = self.__take_data()
+            msg = self.take()
             self.__data_ready.wait()
         return msg
 
-    # TODO(sloretz) this belongs elsewhere
-    def _validate_qos_or_depth_parameter(self, qos_or_depth) -> QoSProfile:
-        if isinstance(qos_or_depth, QoSProfile):
-            return qos_or_depth
-        elif isinstance(qos_or_depth, int):
-            if qos_or_depth < 0:
-                raise ValueError('history depth must be greater than or equal to zero')
-            return QoSProfile(depth=qos_or_depth)
-        else:
-            raise TypeError(
-                'Expected QoSProfile or int, but received {!r}'.format(type(qos_or_depth)))
-
     @property
     def handle(self):
         return self.__subscriber
+
+    @property
+    def topic_name(self) -> str:
+        with self.handle:
+            return self.__subscriber.get_topic_name()
+
+    def wait_for_publishers(self, count: int = 1, *, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until at least count publishers can be matched with this subscriber.
+
+        Publishers with another message type or incompatible QoS are not
+        counted.
+
+        :return: True if they were found, or False on timeout or shutdown.
+        """
+        topic = self.topic_name
+        msg_type_name = type_name(self.__msg_type)
+        graph = self.__node.graph
+
+        def matched():
+            compatible = 0
+            for info in graph.publishers_info(topic):
+                if info.topic_type != msg_type_name:
+                    continue
+                compatibility, _ = qos_check_compatible(info.qos_profile, self.__qos_profile)
+                if compatibility != QoSCompatibility.ERROR:
+                    compatible += 1
+            return compatible >= count
+
+        return graph.wait_for(matched, timeout)
+
+
+def create_subscribers(
+    msg_types_and_topics: Iterable[Tuple[MsgType, str]],
+    qos_profile: Union[QoSProfile, int],
+    *,
+    node: Node = None,
+    execution_mediator = None,
+) -> List[Subscriber]:
+    """
+    Create many subscribers on one node.
+
+    The node handle is entered once, QoS is resolved once, each message type
+    is checked once, and the mediator rebuilds its wait set once for all of
+    them instead of once per subscriber.
+    """
+    msg_types_and_topics = list(msg_types_and_topics)
+    for msg_type in {msg_type for msg_type, _ in msg_types_and_topics}:
+        check_is_valid_msg_type(msg_type)
+    node, execution_mediator = _node_and_mediator(node, execution_mediator)
+    qos_profile = validate_qos_or_depth_parameter(qos_profile)
+    c_qos_profile = get_c_qos_profile(qos_profile)
+
+    subscribers = []
+    with node.handle, execution_mediator.batch():
+        for msg_type, topic in msg_types_and_topics:
+            sub = Subscriber.__new__(Subscriber)
+            sub._init(
+                msg_type, topic, qos_profile, c_qos_profile, node,
+                None, execution_mediator)
+            subscribers.append(sub)
+    return subscribers
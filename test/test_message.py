@@ -0,0 +1,58 @@
+# Copyright 2021 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import types
+
+import pytest
+
+from reros.message import import_type
+from reros.message import type_name
+
+
+@pytest.fixture
+def fake_interfaces(monkeypatch):
+    """Lay out modules the way rosidl generates them for a msg and an action."""
+    def add_module(name, **attrs):
+        module = types.ModuleType(name)
+        for attr, value in attrs.items():
+            value.__module__ = name
+            setattr(module, attr, value)
+        monkeypatch.setitem(sys.modules, name, module)
+        return module
+
+    String = type('String', (), {})
+    Fibonacci = type('Fibonacci', (), {})
+    FeedbackMessage = type('Fibonacci_FeedbackMessage', (), {})
+
+    add_module('fake_interfaces')
+    add_module('fake_interfaces.msg._string', String=String)
+    add_module('fake_interfaces.msg').String = String
+    add_module('fake_interfaces.action._fibonacci',
+               Fibonacci=Fibonacci, Fibonacci_FeedbackMessage=FeedbackMessage)
+    add_module('fake_interfaces.action').Fibonacci = Fibonacci
+    return String, FeedbackMessage
+
+
+def test_message_type_name(fake_interfaces):
+    String, _ = fake_interfaces
+    assert type_name(String) == 'fake_interfaces/msg/String'
+    assert import_type('fake_interfaces/msg/String') is String
+
+
+def test_action_message_type_name(fake_interfaces):
+    _, FeedbackMessage = fake_interfaces
+    name = type_name(FeedbackMessage)
+    assert name == 'fake_interfaces/action/Fibonacci_FeedbackMessage'
+    assert import_type(name) is FeedbackMessage
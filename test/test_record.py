@@ -0,0 +1,121 @@
+# Copyright 2021 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from reros.record import RecordWriter
+from reros.record import Replayer
+
+
+TOPICS = [('/chatter', 'std_msgs/msg/String'), ('/status', 'std_msgs/msg/Int32')]
+
+# (topic_id, received_ns, data), appended out of receive order like a
+# recorder draining one subscriber at a time
+RECORDS = [
+    (0, 100, b'a0'),
+    (0, 300, b'a1'),
+    (1, 200, b'b0'),
+    (1, 400, b'b1'),
+    (0, 500, b'a2'),
+    (1, 600, b'b2'),
+]
+
+
+def _expected(start_ns=None):
+    return [
+        (TOPICS[topic_id][0], received_ns, data)
+        for topic_id, received_ns, data in sorted(RECORDS, key=lambda r: r[1])
+        if start_ns is None or received_ns >= start_ns]
+
+
+@pytest.fixture(params=[1, 1024 * 1024], ids=['small_chunks', 'one_chunk'])
+def recording(request, tmp_path):
+    path = str(tmp_path / 'test.rec')
+    with RecordWriter(path, TOPICS, chunk_size=request.param) as writer:
+        for record in RECORDS:
+            writer.append(*record)
+    return path
+
+
+def test_round_trip(recording):
+    with Replayer(recording) as replayer:
+        assert replayer.topics == dict(TOPICS)
+        assert replayer.start_ns == 100
+        assert replayer.end_ns == 600
+        assert [tuple(msg) for msg in replayer.messages()] == _expected()
+
+
+@pytest.mark.parametrize('start_ns', [0, 100, 250, 500, 600, 700])
+def test_seek(recording, start_ns):
+    with Replayer(recording) as replayer:
+        assert [tuple(msg) for msg in replayer.messages(start_ns)] == _expected(start_ns)
+
+
+def test_recover_without_index(recording, tmp_path):
+    with open(recording, 'rb') as f:
+        data = f.read()
+
+    # Cut the file inside the index so the footer is missing
+    truncated = str(tmp_path / 'truncated.rec')
+    index_start = data.rindex(b'INDX')
+    with open(truncated, 'wb') as f:
+        f.write(data[:index_start + 2])
+
+    with Replayer(truncated) as replayer:
+        assert [tuple(msg) for msg in replayer.messages()] == _expected()
+
+
+def test_recover_partial_chunk(tmp_path):
+    path = str(tmp_path / 'partial.rec')
+    with RecordWriter(path, TOPICS, chunk_size=1) as writer:
+        for record in RECORDS:
+            writer.append(*record)
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    # Cut the file inside the last chunk; only complete chunks are replayed
+    last_chunk = data.rindex(b'CHNK')
+    with open(path, 'wb') as f:
+        f.write(data[:last_chunk + 10])
+
+    with Replayer(path) as replayer:
+        assert [tuple(msg) for msg in replayer.messages()] == _expected()[:-1]
+
+
+def test_not_a_recording(tmp_path):
+    path = tmp_path / 'bogus.rec'
+    path.write_bytes(b'not a recording at all')
+    with pytest.raises(ValueError):
+        Replayer(str(path))
+
+
+def test_overlapping_chunks(tmp_path):
+    # Each topic is drained in bursts, so neighboring chunks overlap in time
+    records = []
+    for burst in range(20):
+        for topic_id in range(2):
+            for i in range(3):
+                records.append((topic_id, burst * 100 + i * 20 + topic_id * 10, b'x'))
+
+    path = str(tmp_path / 'overlap.rec')
+    record_size = 8 + 4 + 2 + 1
+    with RecordWriter(path, TOPICS, chunk_size=2 * record_size) as writer:
+        for record in records:
+            writer.append(*record)
+
+    with Replayer(path) as replayer:
+        times = [msg.received_ns for msg in replayer.messages()]
+        assert times == sorted(r[1] for r in records)
+        times = [msg.received_ns for msg in replayer.messages(1005)]
+        assert times == sorted(r[1] for r in records if r[1] >= 1005)
@@ -0,0 +1,142 @@
+# Copyright 2021 Open Source Robotics Foundation, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from threading import Timer
+
+import time
+
+import pytest
+
+from reros.selector import select
+from reros.selector import Selector
+
+
+class FakeSubscriber:
+    """Stands in for a Subscriber with the interface a Selector uses."""
+
+    def __init__(self, name):
+        self.name = name
+        self.listeners = []
+        self.queue = []
+
+    def _add_ready_listener(self, listener):
+        self.listeners.append(listener)
+
+    def _remove_ready_listener(self, listener):
+        self.listeners.remove(listener)
+
+    def take(self):
+        if self.queue:
+            return self.queue.pop(0)
+        return None
+
+    def receive(self, *msgs):
+        """Queue messages and notify listeners like the mediator would."""
+        self.queue.extend(msgs)
+        for listener in tuple(self.listeners):
+            listener(self)
+
+
+def test_no_subscribers():
+    with pytest.raises(ValueError):
+        Selector()
+
+
+def test_readiness_order():
+    a = FakeSubscriber('a')
+    b = FakeSubscriber('b')
+    selector = select(a, b, timeout=0.01)
+    a.receive('a0', 'a1', 'a2')
+    b.receive('b0', 'b1')
+
+    # A backlogged subscriber takes turns with ones that became ready later
+    assert [msg for _, msg in selector] == ['a0', 'b0', 'a1', 'b1', 'a2']
+
+
+def test_yields_subscriber():
+    a = FakeSubscriber('a')
+    b = FakeSubscriber('b')
+    with select(a, b, timeout=0.01) as selector:
+        b.receive('b0')
+        assert next(selector) == (b, 'b0')
+
+
+def test_timeout_closes():
+    a = FakeSubscriber('a')
+    start = time.monotonic()
+    assert list(select(a, timeout=0.05)) == []
+    assert time.monotonic() - start >= 0.05
+    assert a.listeners == []
+
+
+def test_close_from_another_thread():
+    a = FakeSubscriber('a')
+    selector = select(a)
+    Timer(0.05, selector.close).start()
+    assert list(selector) == []
+    assert a.listeners == []
+
+
+def test_context_manager_closes():
+    a = FakeSubscriber('a')
+    with select(a) as selector:
+        a.receive('a0')
+        for _, msg in selector:
+            break
+    assert a.listeners == []
+
+
+def test_message_from_another_thread():
+    a = FakeSubscriber('a')
+    with select(a, timeout=1.0) as selector:
+        Timer(0.05, a.receive, args=('a0',)).start()
+        assert next(selector) == (a, 'a0')
+
+
+def test_async_iteration():
+    a = FakeSubscriber('a')
+    b = FakeSubscriber('b')
+
+    async def collect():
+        selector = select(a, b, timeout=0.05)
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.01, a.receive, 'a0')
+        loop.call_later(0.02, b.receive, 'b0')
+        return [msg async for _, msg in selector]
+
+    assert asyncio.run(collect()) == ['a0', 'b0']
+    assert a.listeners == []
+    assert b.listeners == []
+
+
+def test_async_cancel_after_loop_closed():
+    a = FakeSubscriber('a')
+    selector = select(a)
+
+    async def cancel_waiter():
+        task = asyncio.ensure_future(selector.__anext__())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(cancel_waiter())
+    loop.close()
+
+    assert selector._Selector__async_waiters == []
+    # Notifying must not raise on the mediator's thread now the loop is closed
+    a.receive('a0')
+    selector.close()